@@ -1,219 +1,394 @@
-import csv
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-import re
-
-class ScheduleBuilder:
-    def __init__(self):
-        self.time_slots = []
-        self.groups = {}
-        self.schedule_data = []
-
-    def parse_hierarchy(self, group_name: str) -> Tuple[List[str], str]:
-        """
-        Parse hierarchical group names like "Players - Planners - AOs"
-        Returns tuple of (hierarchy_levels, leaf_name)
-        """
-        if ' - ' in group_name:
-            parts = [part.strip() for part in group_name.split(' - ')]
-            return parts[:-1], parts[-1]
-        else:
-            return [], group_name
-
-    def generate_time_slots(self, start_time: str, end_time: str, interval_minutes: int = 30) -> List[str]:
-        """
-        Generate time slots between start_time and end_time
-        Format: "HHMM" (24-hour format)
-        """
-        start_hour = int(start_time[:2])
-        start_min = int(start_time[2:])
-
-        # Handle 2400 as midnight (0000 of next day)
-        if end_time == "2400":
-            end_hour = 23
-            end_min = 59
-        else:
-            end_hour = int(end_time[:2])
-            end_min = int(end_time[2:])
-
-        start_dt = datetime(2000, 1, 1, start_hour, start_min)
-        end_dt = datetime(2000, 1, 1, end_hour, end_min)
-
-        # Handle overnight schedules or 2400 case
-        if end_dt <= start_dt or end_time == "2400":
-            end_dt += timedelta(days=1)
-
-        slots = []
-        current = start_dt
-        while current <= end_dt:
-            time_str = current.strftime("%H%M")
-            # Convert midnight to 2400 format if needed
-            if time_str == "0000" and current > start_dt:
-                time_str = "2400"
-            slots.append(time_str)
-            current += timedelta(minutes=interval_minutes)
-
-        return slots
-
-    def add_group(self, group_name: str, activities: Dict[str, str] = None, locations: List[str] = None):
-        """
-        Add a group with optional activities and locations
-        group_name: hierarchical name like "Players - Planners - AOs"
-        activities: dict mapping time slots to activity descriptions
-        locations: list of locations for this group
-        """
-        hierarchy, leaf_name = self.parse_hierarchy(group_name)
-
-        if group_name not in self.groups:
-            self.groups[group_name] = {
-                'hierarchy': hierarchy,
-                'leaf_name': leaf_name,
-                'activities': activities or {},
-                'locations': locations or []
-            }
-
-    def set_time_period(self, start_time: str, end_time: str, interval_minutes: int = 30):
-        """
-        Set the time period for the schedule
-        """
-        self.time_slots = self.generate_time_slots(start_time, end_time, interval_minutes)
-
-    def add_activity(self, group_name: str, time_slot: str, activity: str, location: str = ""):
-        """
-        Add an activity for a specific group at a specific time
-        """
-        if group_name not in self.groups:
-            self.add_group(group_name)
-
-        self.groups[group_name]['activities'][time_slot] = activity
-        if location and location not in self.groups[group_name]['locations']:
-            self.groups[group_name]['locations'].append(location)
-
-    def build_schedule_structure(self) -> List[List[str]]:
-        """
-        Build the hierarchical schedule structure similar to the existing CSV format
-        """
-        if not self.time_slots:
-            raise ValueError("Time period must be set before building schedule")
-
-        # Create header row with time slots
-        header = ['', '', ''] + self.time_slots
-        schedule = [header, ['', '', ''] + [''] * len(self.time_slots)]  # Empty row
-
-        # Group by hierarchy levels
-        hierarchy_groups = {}
-        for group_name, group_data in self.groups.items():
-            hierarchy = group_data['hierarchy']
-            leaf = group_data['leaf_name']
-
-            # Create hierarchy key
-            if not hierarchy:
-                # Top-level group
-                key = (group_name,)
-            else:
-                key = tuple(hierarchy + [leaf])
-
-            hierarchy_groups[key] = group_data
-
-        # Sort groups by hierarchy
-        sorted_groups = sorted(hierarchy_groups.items())
-
-        current_top_level = None
-        current_second_level = None
-
-        for group_key, group_data in sorted_groups:
-            hierarchy = group_data['hierarchy']
-            leaf = group_data['leaf_name']
-            activities = group_data['activities']
-            locations = group_data['locations']
-
-            # Determine the row structure based on hierarchy depth
-            if len(group_key) == 1:
-                # Top-level group
-                current_top_level = group_key[0]
-                current_second_level = None
-                row = [current_top_level, '', '']
-            elif len(group_key) == 2:
-                # Second-level group
-                top_level = group_key[0] if group_key[0] != current_top_level else ''
-                current_top_level = group_key[0]
-                current_second_level = group_key[1]
-                row = [top_level, current_second_level, '']
-            elif len(group_key) == 3:
-                # Third-level group
-                top_level = group_key[0] if group_key[0] != current_top_level else ''
-                second_level = group_key[1] if group_key[1] != current_second_level else ''
-                current_top_level = group_key[0]
-                current_second_level = group_key[1]
-                row = [top_level, second_level, group_key[2]]
-            else:
-                # Handle deeper hierarchies by using the last level as the third column
-                row = ['', '', leaf]
-
-            # Add location info if available
-            if locations:
-                if row[2]:
-                    row[2] += f" ({', '.join(locations)})"
-                else:
-                    row[2] = f"({', '.join(locations)})"
-
-            # Fill in activities for each time slot
-            for time_slot in self.time_slots:
-                activity = activities.get(time_slot, '')
-                row.append(activity)
-
-            schedule.append(row)
-
-        return schedule
-
-    def export_to_csv(self, filename: str):
-        """
-        Export the schedule to a CSV file
-        """
-        schedule = self.build_schedule_structure()
-
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            for row in schedule:
-                writer.writerow(row)
-
-    def export_to_dict(self) -> Dict:
-        """
-        Export the schedule as a dictionary for programmatic use
-        """
-        return {
-            'time_slots': self.time_slots,
-            'groups': self.groups,
-            'schedule': self.build_schedule_structure()
-        }
-
-def create_example_schedule() -> ScheduleBuilder:
-    """
-    Create an example schedule to demonstrate the functionality
-    """
-    builder = ScheduleBuilder()
-
-    # Set time period from 0530 to 2400 with 30-minute intervals
-    builder.set_time_period("0530", "2400", 30)
-
-    # Add hierarchical groups with activities
-    builder.add_group("Players - Echelon 2 & 3 - CPF")
-    builder.add_activity("Players - Echelon 2 & 3 - CPF", "0630", "SAP CUB")
-    builder.add_activity("Players - Echelon 2 & 3 - CPF", "0700", "TS Cmdrs Update Brief (CUB)")
-    builder.add_activity("Players - Echelon 2 & 3 - CPF", "0800", "Supervise Mission Creation")
-
-    builder.add_group("Players - Echelon 2 & 3 - Commanders")
-    builder.add_activity("Players - Echelon 2 & 3 - Commanders", "1130", "Submit Msns")
-    builder.add_activity("Players - Echelon 2 & 3 - Commanders", "1200", "Lunch")
-
-    builder.add_group("Players - Planners - Leads")
-    builder.add_activity("Players - Planners - Leads", "0700", "CUB")
-    builder.add_activity("Players - Planners - Leads", "0800", "Direct Planning")
-
-    return builder
-
-if __name__ == "__main__":
-    # Example usage
-    schedule = create_example_schedule()
-    schedule.export_to_csv("example_schedule.csv")
+import bisect
+import csv
+import io
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy  # type: ignore[import-not-found]
+except ImportError:
+    numpy = None  # type: ignore[assignment]
+
+try:
+    import liburing  # type: ignore[import-not-found]
+except ImportError:
+    liburing = None  # type: ignore[assignment]
+import re
+
+class ScheduleBuilder:
+    def __init__(self) -> None:
+        self.time_slots: Tuple[str, ...] = ()
+        self._empty_slots: Tuple[str, ...] = ()
+        self._row_suffix: Optional[Callable[[Callable, int], List[str]]] = None
+        self._row_suffix_slots: Tuple[str, ...] = ()
+        # Structure-of-arrays group storage: parallel lists indexed by
+        # group position, with a name -> index map for O(1) lookup
+        self._names: List[str] = []
+        self._hierarchies: List[List[str]] = []
+        self._leaves: List[str] = []
+        # (hierarchy key, group index) pairs kept sorted as groups are
+        # added, so builds never re-sort
+        self._sorted_keys: List[Tuple[Tuple[str, ...], int]] = []
+        # One flat activity table keyed by (group index, time slot) so
+        # lookups hit a single large dict instead of many small ones
+        self._activities: Dict[Tuple[int, str], str] = {}
+        self._has_activities: List[bool] = []
+        self._locations: List[Dict[str, None]] = []
+        self._name_to_idx: Dict[str, int] = {}
+        self.schedule_data: List[Any] = []
+
+    @property
+    def groups(self) -> Dict[str, Dict]:
+        """
+        Dict-of-dicts view of the group storage, keyed by full group name
+        """
+        activities_by_group: Dict[int, Dict[str, str]] = {idx: {} for idx in self._name_to_idx.values()}
+        for (idx, slot), activity in self._activities.items():
+            activities_by_group[idx][slot] = activity
+
+        return {
+            name: {
+                'hierarchy': self._hierarchies[idx],
+                'leaf_name': self._leaves[idx],
+                'activities': activities_by_group[idx],
+                'locations': list(self._locations[idx])
+            }
+            for name, idx in self._name_to_idx.items()
+        }
+
+    def parse_hierarchy(self, group_name: str) -> Tuple[List[str], str]:
+        """
+        Parse hierarchical group names like "Players - Planners - AOs"
+        Returns tuple of (hierarchy_levels, leaf_name)
+        """
+        parts = group_name.split(' - ')
+        if len(parts) > 1:
+            # Intern the level names: they repeat across sibling groups
+            return [sys.intern(p) for p in parts[:-1]], sys.intern(parts[-1])
+        return [], group_name
+
+    def generate_time_slots(self, start_time: str, end_time: str, interval_minutes: int = 30) -> List[str]:
+        """
+        Generate time slots between start_time and end_time
+        Format: "HHMM" (24-hour format)
+        """
+        start = int(start_time[:2]) * 60 + int(start_time[2:])
+
+        # Handle 2400 as midnight (end of day)
+        if end_time == "2400":
+            end = 24 * 60
+        else:
+            end = int(end_time[:2]) * 60 + int(end_time[2:])
+
+        # Handle overnight schedules
+        if end <= start:
+            end += 24 * 60
+
+        slots = []
+        for minutes in range(start, end + 1, interval_minutes):
+            # Keep midnight at the end of the schedule in 2400 format
+            if minutes == 24 * 60:
+                slots.append("2400")
+            else:
+                hour, minute = divmod(minutes % (24 * 60), 60)
+                slots.append(f"{hour:02d}{minute:02d}")
+
+        return slots
+
+    def add_group(self, group_name: str, activities: Optional[Dict[str, str]] = None,
+                  locations: Optional[List[str]] = None) -> None:
+        """
+        Add a group with optional activities and locations
+        group_name: hierarchical name like "Players - Planners - AOs"
+        activities: dict mapping time slots to activity descriptions
+        locations: list of locations for this group
+        """
+        group_name = group_name.strip()
+
+        if group_name not in self._name_to_idx:
+            hierarchy, leaf_name = self.parse_hierarchy(group_name)
+            idx = len(self._names)
+            self._name_to_idx[group_name] = idx
+            self._names.append(group_name)
+            self._hierarchies.append(hierarchy)
+            self._leaves.append(leaf_name)
+            # Precompute the sort key and slot it into the sorted index
+            key = tuple(hierarchy + [leaf_name]) if hierarchy else (group_name,)
+            bisect.insort(self._sorted_keys, (key, idx))
+            for time_slot, activity in (activities or {}).items():
+                self._activities[(idx, time_slot)] = activity
+            self._has_activities.append(bool(activities))
+            # Dict used as an ordered set: O(1) membership, insertion order
+            self._locations.append(dict.fromkeys(locations or []))
+
+    def set_time_period(self, start_time: str, end_time: str, interval_minutes: int = 30) -> None:
+        """
+        Set the time period for the schedule
+        """
+        # Freeze the slots and cache a blank-row template so builds can
+        # reuse them without reallocating per call
+        self.time_slots = tuple(self.generate_time_slots(start_time, end_time, interval_minutes))
+        self._empty_slots = ('',) * len(self.time_slots)
+
+        # Generate a row builder specialized to these slots: the slot loop
+        # is unrolled into one expression, so filling a row is a single
+        # bytecode sequence with no per-slot Python iteration
+        lookups = ', '.join(f"get((idx, {slot!r}), '')" for slot in self.time_slots)
+        namespace: Dict[str, Any] = {}
+        exec(f"def _row_suffix(get, idx):\n    return [{lookups}]\n", namespace)
+        self._row_suffix = namespace['_row_suffix']
+        # Remember which slots the builder was generated for, so it can be
+        # bypassed if time_slots is later reassigned directly
+        self._row_suffix_slots = self.time_slots
+
+    def add_activity(self, group_name: str, time_slot: str, activity: str, location: str = "") -> None:
+        """
+        Add an activity for a specific group at a specific time
+        """
+        group_name = group_name.strip()
+
+        idx = self._name_to_idx.get(group_name)
+        if idx is None:
+            self.add_group(group_name)
+            idx = self._name_to_idx[group_name]
+
+        # Intern repeated labels ("Lunch", room names) so large schedules
+        # store one copy per unique value and dict probes compare pointers
+        self._activities[(idx, time_slot)] = sys.intern(activity)
+        self._has_activities[idx] = True
+        if location:
+            self._locations[idx][sys.intern(location)] = None
+
+    def iter_schedule_rows(self) -> Iterator[List[str]]:
+        """
+        Yield schedule rows one at a time so exports can stream them
+        without holding the whole structure in memory
+        """
+        if not self.time_slots:
+            raise ValueError("Time period must be set before building schedule")
+
+        slots = self.time_slots
+        # Recompute the empty suffix when time_slots was assigned directly
+        # without set_time_period, so every row stays rectangular
+        empty = self._empty_slots if len(self._empty_slots) == len(slots) else ('',) * len(slots)
+
+        # Header row with time slots, then an empty row
+        yield ['', '', ''] + list(slots)
+        yield ['', '', ''] + list(empty)
+
+        # Local references to the parallel group arrays
+        leaves = self._leaves
+        locations_list = self._locations
+        get = self._activities.get
+
+        current_top_level = None
+        current_second_level = None
+        # Only trust the generated row builder if it matches the current
+        # slots; like empty above, time_slots may have been reassigned
+        row_suffix = self._row_suffix if self._row_suffix_slots == slots else None
+
+        # One reusable row buffer; each group writes into it in place and
+        # yields a copy, so allocation stays constant-size per row
+        buf = [''] * (3 + len(slots))
+        has_activities = self._has_activities
+
+        # With NumPy available, fill the whole activity matrix in C via
+        # fancy indexing instead of probing the dict per group per slot
+        suffix_matrix = None
+        if numpy is not None and self._activities:
+            slot_to_col = {t: c for c, t in enumerate(slots)}
+            suffix_matrix = numpy.full((len(self._names), len(slots)), '', dtype=object)
+            rows_idx = []
+            cols_idx = []
+            values = []
+            for (gidx, slot), activity in self._activities.items():
+                col = slot_to_col.get(slot)
+                if col is not None:
+                    rows_idx.append(gidx)
+                    cols_idx.append(col)
+                    values.append(activity)
+            if values:
+                suffix_matrix[rows_idx, cols_idx] = numpy.array(values, dtype=object)
+
+        # Group order comes straight from the index maintained in add_group
+        for group_key, i in self._sorted_keys:
+            leaf = leaves[i]
+            locations = locations_list[i]
+
+            # Determine the row structure based on hierarchy depth: pad the
+            # key to three columns and blank out levels that repeat the
+            # previous row (the second level only collapses on depth-3 rows)
+            if len(group_key) <= 3:
+                top, second, third = (group_key + ('', ''))[:3]
+                buf[0] = '' if top == current_top_level else top
+                buf[1] = '' if third and second == current_second_level else second
+                buf[2] = third
+                current_top_level = top
+                current_second_level = second
+            else:
+                # Handle deeper hierarchies by using the last level as the third column
+                buf[0] = buf[1] = ''
+                buf[2] = leaf
+
+            # Add location info if available
+            if locations:
+                joined = ', '.join(locations)
+                buf[2] = f"{buf[2]} ({joined})" if buf[2] else f"({joined})"
+
+            # Fill in activities for each time slot; placeholder groups
+            # with none just splice in the cached empty suffix
+            if not has_activities[i]:
+                buf[3:] = empty
+            elif suffix_matrix is not None:
+                buf[3:] = suffix_matrix[i].tolist()
+            elif row_suffix is not None:
+                buf[3:] = row_suffix(get, i)
+            else:
+                # time_slots was set directly without set_time_period
+                buf[3:] = [get((i, t), '') for t in slots]
+
+            yield list(buf)
+
+    def build_schedule_structure(self) -> List[List[str]]:
+        """
+        Build the hierarchical schedule structure similar to the existing CSV format
+        """
+        return list(self.iter_schedule_rows())
+
+    def export_to_bytes(self) -> bytes:
+        """
+        Serialize the schedule to CSV bytes in a single in-memory pass
+        """
+        buf = io.BytesIO()
+        text = io.TextIOWrapper(buf, encoding='utf-8', newline='', write_through=True)
+        csv.writer(text).writerows(self.iter_schedule_rows())
+        # Detach so the wrapper can't close the buffer when collected
+        text.detach()
+        return buf.getvalue()
+
+    def export_to_csv(self, filename: str) -> None:
+        """
+        Export the schedule to a CSV file in one write
+        """
+        Path(filename).write_bytes(self.export_to_bytes())
+
+    def export_to_dict(self) -> Dict:
+        """
+        Export the schedule as a dictionary for programmatic use
+        """
+        return {
+            'time_slots': self.time_slots,
+            'groups': self.groups,
+            'schedule': self.build_schedule_structure()
+        }
+
+def export_many_to_csv(builders: Dict[str, ScheduleBuilder]) -> None:
+    """
+    Export several schedules to CSV files in one batch
+    builders: dict mapping destination filenames to ScheduleBuilder instances
+
+    On Linux hosts with the liburing binding installed, every file write is
+    submitted through a single io_uring ring so the kernel executes them in
+    parallel; elsewhere each schedule falls back to export_to_csv.
+    """
+    if liburing is None:
+        for filename, builder in builders.items():
+            builder.export_to_csv(filename)
+        return
+
+    # Serialize each schedule to an in-memory buffer up front
+    payloads = [(filename, builder.export_to_bytes())
+                for filename, builder in builders.items()]
+
+    ring = liburing.io_uring()
+    liburing.io_uring_queue_init(256, ring, 0)
+    fds = []
+    # writes[tag] = [filename, fd, data, bytes written so far, in-flight buffer]
+    writes: List[List[Any]] = []
+    pending = 0
+    cqe = liburing.io_uring_cqe()
+
+    def queue_write(tag: int) -> None:
+        nonlocal pending
+        sqe = liburing.io_uring_get_sqe(ring)
+        while sqe is None:
+            # Ring is full; flush and reap until a slot frees up
+            liburing.io_uring_submit(ring)
+            reap_one()
+            sqe = liburing.io_uring_get_sqe(ring)
+        filename, fd, data, done = writes[tag][:4]
+        # The kernel reads the buffer asynchronously after submit, so the
+        # slice must stay referenced until its completion is reaped
+        in_flight = data[done:]
+        writes[tag][4] = in_flight
+        liburing.io_uring_prep_write(sqe, fd, in_flight, len(in_flight), done)
+        sqe.user_data = tag
+        pending += 1
+
+    def reap_one() -> None:
+        nonlocal pending
+        liburing.io_uring_wait_cqe(ring, cqe)
+        tag = cqe.user_data
+        res = cqe.res
+        liburing.io_uring_cqe_seen(ring, cqe)
+        pending -= 1
+        filename, fd, data, done = writes[tag][:4]
+        # Kernel is done with the submitted buffer; release it
+        writes[tag][4] = None
+        if res < 0:
+            raise OSError(-res, os.strerror(-res), filename)
+        done += res
+        if done < len(data):
+            # Short write: resubmit the remainder
+            writes[tag][3] = done
+            queue_write(tag)
+
+    try:
+        for filename, data in payloads:
+            fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            fds.append(fd)
+            writes.append([filename, fd, data, 0, None])
+            queue_write(len(writes) - 1)
+
+        # One syscall submits every queued write; keep submitting while
+        # reaping so short-write resubmissions reach the kernel too
+        while pending:
+            liburing.io_uring_submit(ring)
+            reap_one()
+    finally:
+        for fd in fds:
+            os.close(fd)
+        liburing.io_uring_queue_exit(ring)
+
+def create_example_schedule() -> ScheduleBuilder:
+    """
+    Create an example schedule to demonstrate the functionality
+    """
+    builder = ScheduleBuilder()
+
+    # Set time period from 0530 to 2400 with 30-minute intervals
+    builder.set_time_period("0530", "2400", 30)
+
+    # Add hierarchical groups with activities
+    builder.add_group("Players - Echelon 2 & 3 - CPF")
+    builder.add_activity("Players - Echelon 2 & 3 - CPF", "0630", "SAP CUB")
+    builder.add_activity("Players - Echelon 2 & 3 - CPF", "0700", "TS Cmdrs Update Brief (CUB)")
+    builder.add_activity("Players - Echelon 2 & 3 - CPF", "0800", "Supervise Mission Creation")
+
+    builder.add_group("Players - Echelon 2 & 3 - Commanders")
+    builder.add_activity("Players - Echelon 2 & 3 - Commanders", "1130", "Submit Msns")
+    builder.add_activity("Players - Echelon 2 & 3 - Commanders", "1200", "Lunch")
+
+    builder.add_group("Players - Planners - Leads")
+    builder.add_activity("Players - Planners - Leads", "0700", "CUB")
+    builder.add_activity("Players - Planners - Leads", "0800", "Direct Planning")
+
+    return builder
+
+if __name__ == "__main__":
+    # Example usage
+    schedule = create_example_schedule()
+    schedule.export_to_csv("example_schedule.csv")
     print("Example schedule created as 'example_schedule.csv'")
\ No newline at end of file
@@ -0,0 +1,19 @@
+from setuptools import setup
+
+# Compile schedule_builder with mypyc when it is available; the hot
+# dict/list/string loops then dispatch through C-level ops instead of
+# the bytecode interpreter. A plain pure-Python install works without
+# it, and any mypyc failure (mypycify exits via SystemExit on type
+# errors) falls back to the pure-Python install too.
+try:
+    from mypyc.build import mypycify
+    ext_modules = mypycify(['schedule_builder.py'])
+except (ImportError, SystemExit):
+    ext_modules = []
+
+setup(
+    name='scheduler',
+    version='1.0',
+    py_modules=['schedule_builder'],
+    ext_modules=ext_modules,
+)